@@ -9,3 +9,14 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 USE_LLM = os.getenv("USE_LLM", "true").lower() == "true"
 OCR_DPI = int(os.getenv("OCR_DPI", "300"))
 IMAGE_DOC_EMPTY_RATIO = float(os.getenv("IMAGE_DOC_EMPTY_RATIO", "0.6"))
+OPTIMIZE_OUTPUT = os.getenv("OPTIMIZE_OUTPUT", "true").lower() == "true"
+OCR_ADAPTIVE = os.getenv("OCR_ADAPTIVE", "false").lower() == "true"
+OCR_LOW_DPI = int(os.getenv("OCR_LOW_DPI", "150"))
+OCR_MIN_CONF = float(os.getenv("OCR_MIN_CONF", "60"))
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "gray")  # none | gray | binary
+OCR_BINARY_THRESHOLD = int(os.getenv("OCR_BINARY_THRESHOLD", "160"))
+WORKERS = int(os.getenv("WORKERS", "1"))
+MAX_REQUESTS = int(os.getenv("MAX_REQUESTS", "500"))  # recycle a worker after N requests (0 = never)
+MAX_REQUESTS_JITTER = int(os.getenv("MAX_REQUESTS_JITTER", "50"))
+PRESCREEN = os.getenv("PRESCREEN", "true").lower() == "true"
+STATS_DIR = os.getenv("STATS_DIR", os.path.join("outputs", "stats"))  # shared by all workers
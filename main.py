@@ -2,15 +2,17 @@ import os
 import uuid
 import json
 import zipfile
+from urllib.parse import quote
 from dotenv import load_dotenv
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.responses import FileResponse
 from fastapi.responses import RedirectResponse
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
 from services.pdf_processor import PDFProcessor
-from services.pii_detector import PIIDetector
+from services.pii_detector import PIIDetector, prescreen_stats
 from services.anonymizer import Anonymizer
 from services.redactor import (
     rects_for_targets,
@@ -45,6 +47,26 @@ def root():
 def health():
     return {"message": "backend is running"}
 
+# pre-screen counters, summed over all worker processes
+@app.get("/stats/prescreen")
+def stats_prescreen():
+    return prescreen_stats()
+
+
+def _original_pdf(raw: bytes, filename: str) -> Response:
+    # nothing to anonymize: hand back the upload instead of rewriting it
+    # (header built like starlette's FileResponse: rfc 5987 for non-ascii names)
+    quoted = quote(filename)
+    if quoted != filename:
+        disposition = f"attachment; filename*=utf-8''{quoted}"
+    else:
+        disposition = f'attachment; filename="{filename}"'
+    return Response(
+        content=raw,
+        media_type="application/pdf",
+        headers={"Content-Disposition": disposition},
+    )
+
 
 # analysis only (JSON)
 @app.post("/upload-pdf/")
@@ -57,7 +79,7 @@ async def upload_pdf(file: UploadFile = File(...)):
         pages = await PDFProcessor(raw).extract_pages()  # pass bytes, not UploadFile
         full_text = "\n\n".join(pages)
 
-        pii = PIIDetector(full_text).detect_all()
+        pii = PIIDetector(full_text, pages=pages).detect_all()
         return {
             "filename": file.filename,
             "extracted_text": full_text,
@@ -82,10 +104,12 @@ async def anonymize_pdf(
         pages = await PDFProcessor(raw).extract_pages()
         full_text = "\n\n".join(pages)
 
-        pii = PIIDetector(full_text).detect_all()
+        pii = PIIDetector(full_text, pages=pages).detect_all()
 
         anonymizer = Anonymizer(mode=mode)
         sanitized_pages, mapping, stats = anonymizer.anonymize_pages(pages, pii)
+        if not mapping:
+            return _original_pdf(raw, f"sanitized_{file.filename}")
 
         out_path = os.path.join(OUT_DIR, f"sanitized_{uuid.uuid4().hex}.pdf")
         PDFProcessor(raw).write_pdf(sanitized_pages, out_path)
@@ -123,7 +147,7 @@ async def redact_pdf(file: UploadFile = File(...)):
             ocr = OCREngine(dpi=settings.OCR_DPI)
             ocr_pages = ocr.extract_pages_with_boxes(raw)
             ocr_text = "\n\n".join([p["text"] for p in ocr_pages])
-            pii = PIIDetector(ocr_text).detect_all()
+            pii = PIIDetector(ocr_text, pages=[p["text"] for p in ocr_pages]).detect_all()
 
             targets = []
             for vals in (pii.get("regex") or {}).values():
@@ -131,11 +155,13 @@ async def redact_pdf(file: UploadFile = File(...)):
             for _, vals in (pii.get("spacy") or {}).items():
                 targets.extend(vals)
 
+            if not targets:
+                return _original_pdf(raw, f"redacted_{file.filename}")
             targets_per_page = [targets for _ in ocr_pages]
             rects = rects_for_targets_ocr(ocr_pages, targets_per_page, sizes_pts)
             overlay_buf = make_overlay_pdf(rects, sizes_pts)
         else:
-            pii = PIIDetector(full_text).detect_all()
+            pii = PIIDetector(full_text, pages=pages_text).detect_all()
 
             targets = []
             for vals in (pii.get("regex") or {}).values():
@@ -143,12 +169,14 @@ async def redact_pdf(file: UploadFile = File(...)):
             for _, vals in (pii.get("spacy") or {}).items():
                 targets.extend(vals)
 
+            if not targets:
+                return _original_pdf(raw, f"redacted_{file.filename}")
             targets_per_page = [targets for _ in words_per_page]
             rects = rects_for_targets(words_per_page, targets_per_page)
             overlay_buf = make_overlay_pdf(rects, sizes_pts)
 
         out_path = os.path.join(OUT_DIR, f"redacted_{uuid.uuid4().hex}.pdf")
-        merge_overlay(raw, overlay_buf, out_path)
+        merge_overlay(raw, overlay_buf, out_path, rects_per_page=rects)
 
         return FileResponse(
             path=out_path,
@@ -173,7 +201,7 @@ async def anonymize_bundle(
         pages = await PDFProcessor(raw).extract_pages()
         full_text = "\n\n".join(pages)
 
-        pii = PIIDetector(full_text).detect_all()
+        pii = PIIDetector(full_text, pages=pages).detect_all()
 
         # anonymize
         anon = Anonymizer(mode=mode)
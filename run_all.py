@@ -1,19 +1,58 @@
 # runs backend + serves frontend
+import gc
 import os
 import uvicorn
 from fastapi.staticfiles import StaticFiles
 
 # import your existing FastAPI app (endpoints, CORS, etc.)
+# (this also loads spaCy + the OpenAI client, so in multi-worker mode
+#  they live in the master and are shared copy-on-write after fork)
 from main import app as backend_app
+from config import settings
 
 # mount the frontend at /ui (so no route conflicts with your API)
 FRONTEND_DIR = os.path.join(os.path.dirname(__file__), "frontend")
 os.makedirs(FRONTEND_DIR, exist_ok=True)  # safe if already exists
 backend_app.mount("/ui", StaticFiles(directory=FRONTEND_DIR, html=True), name="ui")
 
+
+def serve_prefork(port: int, workers: int):
+    """gunicorn pre-fork: app + models loaded once here, then forked into uvicorn workers"""
+    from gunicorn.app.base import BaseApplication
+
+    def post_fork(server, worker):
+        # model pages stay shared; only the http client gets rebuilt per worker
+        from services.pii_detector import reset_llm_client
+        reset_llm_client()
+
+    class PreforkApp(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"0.0.0.0:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn_worker.UvicornWorker")
+            self.cfg.set("max_requests", settings.MAX_REQUESTS)
+            self.cfg.set("max_requests_jitter", settings.MAX_REQUESTS_JITTER)
+            self.cfg.set("graceful_timeout", 30)
+            self.cfg.set("post_fork", post_fork)
+
+        def load(self):
+            return backend_app
+
+    # keep gc from touching (and so copying) the preloaded objects in workers
+    gc.collect()
+    gc.freeze()
+    PreforkApp().run()
+
+
 if __name__ == "__main__":
     # one port for everything
     PORT = int(os.getenv("PORT", "8000"))
     print(f"\nUI:  http://127.0.0.1:{PORT}/ui/")
     print(f"API: http://127.0.0.1:{PORT}/docs\n")
-    uvicorn.run(backend_app, host="0.0.0.0", port=PORT)
+    # fresh /stats/prescreen totals for this run (before any worker forks)
+    from services.pii_detector import reset_prescreen_stats
+    reset_prescreen_stats()
+    if settings.WORKERS > 1:
+        serve_prefork(PORT, settings.WORKERS)
+    else:
+        uvicorn.run(backend_app, host="0.0.0.0", port=PORT)
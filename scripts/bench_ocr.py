@@ -0,0 +1,74 @@
+# compare adaptive OCR against the fixed-dpi baseline on one or more PDFs
+# usage: python scripts/bench_ocr.py file1.pdf [file2.pdf ...]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ocr_engine import OCREngine  # noqa: E402
+
+BASELINE_DPI = 300
+
+
+def _norm_boxes(page):
+    # word boxes as fractions of the page so different dpis are comparable
+    W, H = float(page["width_px"]), float(page["height_px"])
+    return [(w["text"].lower(), (w["x"] / W, w["y"] / H, (w["x"] + w["w"]) / W, (w["y"] + w["h"]) / H))
+            for w in page["words"]]
+
+
+def _iou(a, b):
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def box_accuracy(base_pages, cand_pages, min_iou: float = 0.5) -> float:
+    """share of baseline words found by the candidate with same text and IoU >= min_iou"""
+    total = hit = 0
+    for bp, cp in zip(base_pages, cand_pages):
+        cand = _norm_boxes(cp)
+        for text, box in _norm_boxes(bp):
+            total += 1
+            if any(t == text and _iou(box, b) >= min_iou for t, b in cand):
+                hit += 1
+    return hit / total if total else 1.0
+
+
+def _run(engine, raw):
+    t0 = time.perf_counter()
+    pages = engine.extract_pages_with_boxes(raw)
+    return pages, time.perf_counter() - t0
+
+
+def main(paths):
+    if not paths:
+        print("usage: python scripts/bench_ocr.py file.pdf [...]")
+        return 1
+    n_pages = 0
+    t_base = t_adapt = 0.0
+    base_all, adapt_all = [], []
+    for path in paths:
+        with open(path, "rb") as f:
+            raw = f.read()
+        base, tb = _run(OCREngine(dpi=BASELINE_DPI, adaptive=False, preprocess="none"), raw)
+        adapt, ta = _run(OCREngine(dpi=BASELINE_DPI, adaptive=True), raw)
+        n_pages += len(base)
+        t_base += tb
+        t_adapt += ta
+        base_all.extend(base)
+        adapt_all.extend(adapt)
+        print(f"{os.path.basename(path)}: {len(base)} pages  baseline {tb:.2f}s  adaptive {ta:.2f}s")
+
+    print(f"\nbaseline ({BASELINE_DPI} dpi, color): {n_pages / max(t_base, 1e-9):.2f} pages/sec")
+    print(f"adaptive: {n_pages / max(t_adapt, 1e-9):.2f} pages/sec "
+          f"({t_base / max(t_adapt, 1e-9):.2f}x)")
+    print(f"box accuracy vs baseline (text match, IoU>=0.5): {box_accuracy(base_all, adapt_all):.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
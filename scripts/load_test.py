@@ -0,0 +1,120 @@
+# throughput vs worker count: starts run_all.py with WORKERS=n for each n and
+# fires concurrent /upload-pdf/ requests at it
+# usage: python scripts/load_test.py --workers 1 2 4 --requests 200 --concurrency 16 [--pdf file.pdf]
+import argparse
+import io
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sample_pdf() -> bytes:
+    from reportlab.pdfgen import canvas
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for i in range(3):
+        c.drawString(100, 750, f"John Doe lives in New York. Email john{i}@example.com")
+        c.drawString(100, 730, "Phone: +1 202-555-0199")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def _multipart(pdf: bytes):
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="load.pdf"\r\n'
+            "Content-Type: application/pdf\r\n\r\n").encode() + pdf + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _wait_ready(base: str, proc, log_path: str, timeout: float = 120):
+    t0 = time.time()
+    while time.time() - t0 < timeout:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}, see {log_path}")
+        try:
+            with urllib.request.urlopen(f"{base}/health", timeout=2) as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError(f"server did not come up, see {log_path}")
+
+
+def _bench(base: str, body: bytes, ctype: str, n_requests: int, concurrency: int):
+    def one(_):
+        req = urllib.request.Request(f"{base}/upload-pdf/", data=body, headers={"Content-Type": ctype})
+        t = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=300) as r:
+                r.read()
+                ok = r.status == 200
+        except (urllib.error.URLError, OSError):  # HTTPError, refused, timeout
+            ok = False
+        return ok, time.perf_counter() - t
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n_requests)))
+    elapsed = time.perf_counter() - t0
+    lat = sorted(r[1] for r in results)
+    return {
+        "ok": sum(1 for r in results if r[0]),
+        "rps": n_requests / elapsed,
+        "p50": lat[len(lat) // 2],
+        "p95": lat[min(len(lat) - 1, int(len(lat) * 0.95))],
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--pdf", help="pdf to upload (default: small generated sample)")
+    args = ap.parse_args()
+
+    if args.pdf:
+        with open(args.pdf, "rb") as f:
+            pdf = f.read()
+    else:
+        pdf = _sample_pdf()
+    body, ctype = _multipart(pdf)
+    base = f"http://127.0.0.1:{args.port}"
+
+    rows = []
+    for n in args.workers:
+        env = dict(os.environ, WORKERS=str(n), PORT=str(args.port), USE_LLM=os.getenv("USE_LLM", "false"))
+        log_path = os.path.join(ROOT, "outputs", f"load_test_workers{n}.log")
+        log = open(log_path, "w")
+        proc = subprocess.Popen([sys.executable, "run_all.py"], cwd=ROOT, env=env,
+                                stdout=log, stderr=subprocess.STDOUT)
+        try:
+            _wait_ready(base, proc, log_path)
+            _bench(base, body, ctype, min(args.concurrency, args.requests), args.concurrency)  # warm up
+            res = _bench(base, body, ctype, args.requests, args.concurrency)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+            log.close()
+        rows.append((n, res))
+        print(f"workers={n}: {res['rps']:.1f} req/s  p50 {res['p50'] * 1000:.0f}ms  "
+              f"p95 {res['p95'] * 1000:.0f}ms  ok {res['ok']}/{args.requests}")
+
+    base_rps = rows[0][1]["rps"]
+    print("\nscaling vs first run:")
+    for n, res in rows:
+        print(f"  workers={n}: {res['rps'] / base_rps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
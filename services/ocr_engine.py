@@ -1,27 +1,128 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pdf2image import convert_from_bytes
 from pytesseract import image_to_string, image_to_data, Output
 from config import settings
 
+PREPROCESS_MODES = ("none", "gray", "binary")
+
 class OCREngine:
-    def __init__(self, dpi: int = None):
+    def __init__(self, dpi: int = None, adaptive: bool = None, preprocess: str = None):
         self.dpi = dpi or settings.OCR_DPI
+        self.adaptive = settings.OCR_ADAPTIVE if adaptive is None else adaptive
+        self.preprocess = (preprocess or settings.OCR_PREPROCESS).lower()  # none | gray | binary
+        if self.preprocess not in PREPROCESS_MODES:
+            raise ValueError(f"unknown OCR preprocess mode: {self.preprocess!r} "
+                             f"(expected one of {', '.join(PREPROCESS_MODES)})")
+        self.low_dpi = min(settings.OCR_LOW_DPI, self.dpi)
+        self.min_conf = settings.OCR_MIN_CONF
+
+    # ---------- helpers ----------
+    def _prep(self, im):
+        """grayscale or binarize before tesseract; color adds nothing to recognition"""
+        if self.preprocess == "none":
+            return im
+        g = im.convert("L")
+        if self.preprocess == "binary":
+            thr = settings.OCR_BINARY_THRESHOLD
+            g = g.point(lambda p: 255 if p > thr else 0, mode="1")
+        return g
+
+    def _parse_words(self, data: Dict[str, list], scale: float = 1.0,
+                     dx: float = 0, dy: float = 0) -> List[Dict[str, Any]]:
+        # image_to_data rows -> word dicts; scale/offset map crop pixels back to page pixels
+        words = []
+        for i in range(len(data["text"])):
+            t = (data["text"][i] or "").strip()
+            if not t: continue
+            words.append({"text": t,
+                          "x": int(round(dx + data["left"][i] * scale)),
+                          "y": int(round(dy + data["top"][i] * scale)),
+                          "w": int(round(data["width"][i] * scale)),
+                          "h": int(round(data["height"][i] * scale)),
+                          "conf": float(data["conf"][i]),
+                          "line": (data["block_num"][i], data["par_num"][i], data["line_num"][i])})
+        return words
+
+    def _low_conf_lines(self, words: List[Dict[str, Any]]) -> List[Tuple[tuple, Tuple[int, int, int, int]]]:
+        """bounding box (page px) of every text line holding a low-confidence word"""
+        lines: Dict[tuple, List[Dict[str, Any]]] = {}
+        for w in words:
+            lines.setdefault(w["line"], []).append(w)
+        out = []
+        for key, ws in lines.items():
+            if min(w["conf"] for w in ws) >= self.min_conf:
+                continue
+            x0 = min(w["x"] for w in ws)
+            y0 = min(w["y"] for w in ws)
+            x1 = max(w["x"] + w["w"] for w in ws)
+            y1 = max(w["y"] + w["h"] for w in ws)
+            out.append((key, (x0, y0, x1, y1)))
+        return out
+
+    def _page_result(self, im, words: List[Dict[str, Any]]) -> Dict[str, Any]:
+        words = [{k: w[k] for k in ("text", "x", "y", "w", "h", "conf")} for w in words]
+        return {"text": "\n".join(w["text"] for w in words),
+                "width_px": im.width, "height_px": im.height, "words": words}
 
+    def _refine(self, pdf_bytes: bytes, page_no: int, im, words: List[Dict[str, Any]]):
+        """re-ocr low-confidence lines from a high-dpi render, keep coords in low-dpi space"""
+        regions = self._low_conf_lines(words)
+        if not regions:
+            return words
+        hi = convert_from_bytes(pdf_bytes, dpi=self.dpi, first_page=page_no, last_page=page_no)[0]
+        hi = self._prep(hi)
+        scale = im.width / max(1, hi.width)
+        pad = 4
+        for key, (x0, y0, x1, y1) in regions:
+            box = (max(0, int((x0 - pad) / scale)), max(0, int((y0 - pad) / scale)),
+                   min(hi.width, int((x1 + pad) / scale) + 1), min(hi.height, int((y1 + pad) / scale) + 1))
+            crop = hi.crop(box)
+            # psm 7: the crop is a single text line
+            data = image_to_data(crop, output_type=Output.DICT, config="--psm 7")
+            redo = self._parse_words(data, scale=scale, dx=box[0] * scale, dy=box[1] * scale)
+            old = [w for w in words if w["line"] == key]
+            # only swap when the high-dpi pass is actually more confident
+            if redo and min(w["conf"] for w in redo) > min(w["conf"] for w in old):
+                for w in redo:
+                    w["line"] = key
+                at = words.index(old[0])
+                words = [w for w in words if w["line"] != key]
+                words[at:at] = redo
+        return words
+
+    def _layout_text(self, words: List[Dict[str, Any]]) -> str:
+        """rebuild image_to_string-style text: words on a line, blank line between paragraphs"""
+        out, prev = [], None
+        for w in words:
+            line = w["line"]
+            if prev is None:
+                out.append(w["text"])
+            elif line == prev:
+                out.append(" " + w["text"])
+            elif line[:2] == prev[:2]:
+                out.append("\n" + w["text"])
+            else:
+                out.append("\n\n" + w["text"])
+            prev = line
+        return "".join(out)
+
+    def _ocr_words(self, pdf_bytes: bytes):
+        """(image, words) per page; adaptive pages are refined at full dpi"""
+        dpi = self.low_dpi if self.adaptive else self.dpi
+        imgs = convert_from_bytes(pdf_bytes, dpi=dpi)
+        for page_no, im in enumerate(imgs, start=1):
+            data = image_to_data(self._prep(im), output_type=Output.DICT)
+            words = self._parse_words(data)
+            if self.adaptive and self.low_dpi < self.dpi:
+                words = self._refine(pdf_bytes, page_no, im, words)
+            yield im, words
+
+    # ---------- public api ----------
     def extract_pages(self, pdf_bytes: bytes) -> List[str]:
+        if self.adaptive:
+            return [self._layout_text(words) for _, words in self._ocr_words(pdf_bytes)]
         imgs = convert_from_bytes(pdf_bytes, dpi=self.dpi)
-        return [image_to_string(im) or "" for im in imgs]
+        return [image_to_string(self._prep(im)) or "" for im in imgs]
 
     def extract_pages_with_boxes(self, pdf_bytes: bytes) -> List[Dict[str, Any]]:
-        imgs = convert_from_bytes(pdf_bytes, dpi=self.dpi)
-        out = []
-        for im in imgs:
-            data = image_to_data(im, output_type=Output.DICT)
-            words = []
-            for i in range(len(data["text"])):
-                t = (data["text"][i] or "").strip()
-                if not t: continue
-                words.append({"text": t, "x": data["left"][i], "y": data["top"][i],
-                              "w": data["width"][i], "h": data["height"][i]})
-            out.append({"text": "\n".join(w["text"] for w in words),
-                        "width_px": im.width, "height_px": im.height, "words": words})
-        return out
+        return [self._page_result(im, words) for im, words in self._ocr_words(pdf_bytes)]
@@ -1,4 +1,4 @@
-import os, re
+import os, re, time, json, glob, threading
 import spacy
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -12,10 +12,115 @@ nlp = spacy.load(MODEL)
 # pass key explicitly
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
+def reset_llm_client():
+    """new client (and connection pool) per process; http pools are not fork-safe"""
+    global client
+    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+
+# pre-screen: a page with no regex hit and no capitalized word that could start
+# a name/place can't yield PERSON/ORG/GPE, so NER and LLM are skipped for it.
+# recall first: only common sentence starters are allowed to be capitalized,
+# scripts without case (CJK etc.) always go through to NER, and so does any
+# digit or date/number word, since /redact-pdf/ also blacks out spaCy's
+# DATE/CARDINAL/MONEY entities.
+_SENTENCE_SPLIT = re.compile(r"[.!?:;]\s+|\n")
+_WORD = re.compile(r"[^\W\d_][\w'-]*")  # any unicode letter, not just ascii
+_STARTERS = {
+    "A", "An", "The", "This", "That", "These", "Those", "It", "Its", "We", "Our",
+    "You", "Your", "They", "Their", "There", "Here", "In", "On", "At", "For", "If",
+    "When", "Of", "To", "And", "But", "Or", "As", "By", "With", "From", "All", "No",
+    "Yes", "Is", "Are", "Was", "Were", "Please", "Note", "See", "Each", "Some",
+}
+_NUMBERISH = re.compile(
+    r"\d|\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+    r"|monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|today|tonight|yesterday|tomorrow|morning|afternoon|evening|night"
+    r"|second|minute|hour|day|week|month|year|decade|century"
+    r"|zero|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve"
+    r"|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen"
+    r"|twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|million|billion"
+    r"|first|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|half|quarter|dozen"
+    r"|dollar|cent|euro|pound|percent)s?\b",
+    re.IGNORECASE,
+)
+PAGE_SEP = "\n\n"  # pages are joined like the endpoints do before NER
+
+# counters are per process; each process also writes its totals to
+# STATS_DIR so /stats/prescreen can sum every worker, recycled ones included
+_stats_lock = threading.Lock()
+_COUNTERS = ("pages_total", "pages_skipped", "docs_skipped", "time_saved_s")
+PRESCREEN_STATS = {
+    "pages_total": 0,
+    "pages_skipped": 0,
+    "docs_skipped": 0,      # docs where NER + LLM were skipped entirely
+    "time_saved_s": 0.0,    # estimated from measured NER/LLM cost
+    "ner_s_per_char": 0.0,  # running averages used for the estimate
+    "llm_s_per_call": 0.0,
+}
+
+def _stats_path() -> str:
+    return os.path.join(settings.STATS_DIR, f"prescreen_{os.getpid()}.json")
+
+def _flush_stats():
+    # called with _stats_lock held; write-then-rename so readers never see half a file
+    os.makedirs(settings.STATS_DIR, exist_ok=True)
+    path = _stats_path()
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(PRESCREEN_STATS, f)
+    os.replace(tmp, path)
+
+def reset_prescreen_stats():
+    """drop totals from earlier runs; call once before serving (and before fork)"""
+    with _stats_lock:
+        for k, v in PRESCREEN_STATS.items():
+            PRESCREEN_STATS[k] = type(v)()
+        for path in glob.glob(os.path.join(settings.STATS_DIR, "prescreen_*.json")):
+            os.remove(path)
+
+def prescreen_stats() -> dict:
+    """totals summed over every process that wrote to STATS_DIR"""
+    out = {k: 0 for k in _COUNTERS}
+    out["time_saved_s"] = 0.0
+    out["workers"] = 0
+    for path in glob.glob(os.path.join(settings.STATS_DIR, "prescreen_*.json")):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        out["workers"] += 1
+        for k in _COUNTERS:
+            out[k] += data.get(k, 0)
+    return out
+
+def _ewma(key: str, sample: float):
+    old = PRESCREEN_STATS[key]
+    PRESCREEN_STATS[key] = sample if not old else 0.8 * old + 0.2 * sample
+
+def page_is_clean(text: str) -> bool:
+    """cheap check: no regex hit, digit, date/number word, caseless letter, or capitalized token other than a common sentence starter"""
+    if not text.strip():
+        return True
+    if _NUMBERISH.search(text):
+        return False
+    for pat in patterns.values():
+        if re.search(pat, text):
+            return False
+    for sent in _SENTENCE_SPLIT.split(text):
+        for i, w in enumerate(_WORD.findall(sent)):
+            if w[0].isupper() and not (i == 0 and w in _STARTERS):
+                return False
+            if any(c.isalpha() and not c.isupper() and not c.islower() for c in w):
+                return False  # no case to go by
+    return True
+
 class PIIDetector:
-    def __init__(self, text: str, model: str = None):
+    def __init__(self, text: str, model: str = None, pages: list = None):
         self.text = text
         self.model = model or settings.OPENAI_MODEL
+        self.pages = pages  # per-page text for the pre-screen; None = one page
 
     def _dedup(self, seq):
         seen, out = set(), []
@@ -59,8 +164,46 @@ class PIIDetector:
         return resp.choices[0].message.content
 
     def detect_all(self):
-        return {
-            "regex": self.via_regex(),
-            "spacy": self.via_spacy(),
-            "llm": self.via_llm(),
-        }
+        if not settings.PRESCREEN:
+            return {
+                "regex": self.via_regex(),
+                "spacy": self.via_spacy(),
+                "llm": self.via_llm(),
+            }
+
+        regex = self.via_regex()
+        pages = self.pages if self.pages is not None else [self.text]
+        dirty = [p for p in pages if not page_is_clean(p)]
+        skipped_chars = sum(len(p) for p in pages) - sum(len(p) for p in dirty)
+
+        full_text = self.text
+        self.text = dirty_text = PAGE_SEP.join(dirty)
+        try:
+            if dirty:
+                t0 = time.perf_counter()
+                ents = self.via_spacy()
+                ner_s = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                llm = self.via_llm()
+                llm_s = time.perf_counter() - t0
+            else:
+                ents, llm = {}, "skipped: no pii candidates"
+        finally:
+            self.text = full_text
+
+        with _stats_lock:
+            PRESCREEN_STATS["pages_total"] += len(pages)
+            PRESCREEN_STATS["pages_skipped"] += len(pages) - len(dirty)
+            saved = skipped_chars * PRESCREEN_STATS["ner_s_per_char"]
+            if dirty:
+                _ewma("ner_s_per_char", ner_s / max(1, len(dirty_text)))
+                if settings.USE_LLM and settings.OPENAI_API_KEY:
+                    _ewma("llm_s_per_call", llm_s)
+            else:
+                PRESCREEN_STATS["docs_skipped"] += 1
+                if settings.USE_LLM and settings.OPENAI_API_KEY:
+                    saved += PRESCREEN_STATS["llm_s_per_call"]
+            PRESCREEN_STATS["time_saved_s"] += saved
+            _flush_stats()
+
+        return {"regex": regex, "spacy": ents, "llm": llm}
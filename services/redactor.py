@@ -1,7 +1,16 @@
 import io
+import hashlib
 from typing import List, Dict, Tuple
 from reportlab.pdfgen import canvas
 from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    StreamObject,
+)
+from config import settings
 
 # ---------- helpers ----------
 def _norm(s: str) -> str:
@@ -68,6 +77,61 @@ def _find_seq_boxes_ocr(ocr_words, target: str, img_w: int, img_h: int, page_w:
                 break
     return boxes
 
+def _digest(obj, depth: int = 0) -> str:
+    # structural hash of a pdf object; identical fonts/images hash the same
+    # even when the source pdf embeds them as separate objects
+    if isinstance(obj, IndirectObject):
+        obj = obj.get_object()
+    if depth > 8:
+        return repr(obj)
+    h = hashlib.sha1()
+    if isinstance(obj, StreamObject):
+        # raw encoded bytes: decoding fails for filters PyPDF2 lacks (JBIG2)
+        h.update(b"stream")
+        h.update(obj._data or b"")
+    if isinstance(obj, DictionaryObject):
+        for k in sorted(obj.keys()):
+            if k in ("/Parent", "/Length"):
+                continue
+            h.update(k.encode())
+            h.update(_digest(obj[k], depth + 1).encode())
+    elif isinstance(obj, ArrayObject):
+        for v in obj:
+            h.update(_digest(v, depth + 1).encode())
+    else:
+        h.update(repr(obj).encode())
+    return h.hexdigest()
+
+def _dedup_resources(page, seen: Dict[str, IndirectObject], digests: Dict[tuple, str]):
+    # point every font/xobject at the first identical copy seen in the doc;
+    # digests caches per object so a font shared by every page is hashed once
+    res = page.get("/Resources")
+    if res is None:
+        return
+    res = res.get_object()
+    for cat in ("/Font", "/XObject"):
+        group = res.get(cat)
+        if group is None:
+            continue
+        group = group.get_object()
+        for name in list(group.keys()):
+            ref = group.raw_get(name)
+            if not isinstance(ref, IndirectObject):
+                continue
+            # overlay and original are separate readers, so idnums alone can clash
+            ref_id = (id(ref.pdf), ref.idnum, ref.generation)
+            if ref_id not in digests:
+                try:
+                    digests[ref_id] = _digest(ref)
+                except Exception:
+                    digests[ref_id] = None  # leave objects we can't hash alone
+            key = digests[ref_id]
+            if key is None:
+                continue
+            first = seen.setdefault(key, ref)
+            if (id(first.pdf), first.idnum, first.generation) != ref_id:
+                group[NameObject(name)] = first
+
 # ---------- public api ----------
 def rects_for_targets(words_per_page, targets_per_page: List[List[str]]) -> List[List[Tuple[float,float,float,float]]]:
     out = []
@@ -118,13 +182,35 @@ def make_overlay_pdf(rects_per_page, page_sizes_pts) -> io.BytesIO:
     buf.seek(0)
     return buf
 
-def merge_overlay(original_bytes: bytes, overlay_pdf: io.BytesIO, out_path: str):
+def merge_overlay(original_bytes: bytes, overlay_pdf: io.BytesIO, out_path: str,
+                  rects_per_page=None, optimize: bool = None):
+    """
+    Stamp overlay pages onto the original. When rects_per_page is given,
+    pages without boxes are copied as-is instead of merging a blank overlay.
+    With optimize on, merged content streams are flate-compressed and
+    identical fonts/images are shared across pages.
+    """
+    if optimize is None:
+        optimize = settings.OPTIMIZE_OUTPUT
+    if rects_per_page is not None and not any(rects_per_page):
+        # nothing to draw; the original is already the answer
+        with open(out_path, "wb") as f:
+            f.write(original_bytes)
+        return
+
     reader = PdfReader(io.BytesIO(original_bytes))
     overlay = PdfReader(overlay_pdf)
     writer = PdfWriter()
+    seen: Dict[str, IndirectObject] = {}
+    digests: Dict[tuple, str] = {}
     for i, page in enumerate(reader.pages):
-        if i < len(overlay.pages):
+        has_boxes = rects_per_page is None or (i < len(rects_per_page) and rects_per_page[i])
+        if has_boxes and i < len(overlay.pages):
             page.merge_page(overlay.pages[i])
+            if optimize:
+                page.compress_content_streams()
+        if optimize:
+            _dedup_resources(page, seen, digests)
         writer.add_page(page)
     with open(out_path, "wb") as f:
         writer.write(f)
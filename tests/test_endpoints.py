@@ -0,0 +1,21 @@
+import io
+from reportlab.pdfgen import canvas
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+def _clean_pdf() -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    c.drawString(100, 750, "nothing sensitive on this page.")
+    c.save()
+    return buf.getvalue()
+
+def test_no_pii_returns_original_with_unicode_filename():
+    raw = _clean_pdf()
+    for ep in ("/anonymize-pdf/", "/redact-pdf/"):
+        r = client.post(ep, files={"file": ("履歴書.pdf", raw, "application/pdf")})
+        assert r.status_code == 200
+        assert r.content == raw
+        assert "filename*=utf-8''" in r.headers["content-disposition"]
@@ -0,0 +1,76 @@
+from PIL import Image
+from services.ocr_engine import OCREngine
+
+def _data(rows):
+    keys = ["text", "left", "top", "width", "height", "conf", "block_num", "par_num", "line_num"]
+    return {k: [r[i] for r in rows] for i, k in enumerate(keys)}
+
+def test_preprocess_gray_and_binary():
+    im = Image.new("RGB", (10, 10), (200, 30, 30))
+    assert OCREngine(preprocess="gray")._prep(im).mode == "L"
+    assert OCREngine(preprocess="binary")._prep(im).mode == "1"
+    assert OCREngine(preprocess="none")._prep(im).mode == "RGB"
+
+def test_low_conf_lines_and_scaling():
+    eng = OCREngine(dpi=300, adaptive=True)
+    data = _data([
+        ("John", 10, 10, 20, 8, 95, 1, 1, 1),
+        ("", 0, 0, 0, 0, -1, 1, 1, 1),
+        ("D0e", 35, 10, 20, 8, 30, 1, 1, 2),
+    ])
+    words = eng._parse_words(data, scale=0.5, dx=4)
+    assert [w["text"] for w in words] == ["John", "D0e"]
+    assert words[0]["x"] == 9 and words[0]["w"] == 10
+    regions = eng._low_conf_lines(eng._parse_words(data))
+    assert regions == [((1, 1, 2), (35, 10, 55, 18))]
+
+def test_unknown_preprocess_rejected():
+    import pytest
+    with pytest.raises(ValueError):
+        OCREngine(preprocess="grey")
+
+def _refine_setup(monkeypatch, hi_conf):
+    from services import ocr_engine
+    # low-dpi page 100x50 px, high-dpi render 200x100 px -> scale 0.5
+    monkeypatch.setattr(ocr_engine, "convert_from_bytes",
+                        lambda *a, **k: [Image.new("RGB", (200, 100), "white")])
+    crops = []
+    def fake_data(im, **kwargs):
+        crops.append(im.size)
+        return _data([
+            ("Doe", 10, 8, 40, 16, hi_conf, 1, 1, 1),
+            ("Smith", 60, 8, 40, 16, hi_conf, 1, 1, 1),
+        ])
+    monkeypatch.setattr(ocr_engine, "image_to_data", fake_data)
+    eng = OCREngine(dpi=300, adaptive=True)
+    words = eng._parse_words(_data([
+        ("John", 10, 10, 20, 8, 95, 1, 1, 1),
+        ("D0e", 40, 30, 20, 8, 30, 1, 1, 2),
+        ("Smith", 65, 30, 20, 8, 90, 1, 1, 2),
+        ("end", 10, 40, 15, 8, 90, 1, 1, 3),
+    ]))
+    return eng, words, crops
+
+def test_refine_swaps_low_conf_line(monkeypatch):
+    eng, words, crops = _refine_setup(monkeypatch, hi_conf=92)
+    out = eng._refine(b"", 1, Image.new("RGB", (100, 50)), words)
+    assert crops == [(107, 33)]  # line (40,30)-(85,38) padded by 4, in high-dpi px
+    assert [w["text"] for w in out] == ["John", "Doe", "Smith", "end"]
+    # crop origin (72, 52) hi px -> (36, 26) low px; crop coords halved on top
+    assert [(w["x"], w["y"], w["w"], w["h"]) for w in out[1:3]] == [(41, 30, 20, 8), (66, 30, 20, 8)]
+
+def test_refine_keeps_line_when_not_more_confident(monkeypatch):
+    eng, words, _ = _refine_setup(monkeypatch, hi_conf=20)
+    out = eng._refine(b"", 1, Image.new("RGB", (100, 50)), list(words))
+    assert out == words
+
+def test_layout_text_keeps_lines_together():
+    eng = OCREngine(dpi=300, adaptive=True)
+    words = eng._parse_words(_data([
+        ("John", 10, 10, 20, 8, 95, 1, 1, 1),
+        ("Doe", 35, 10, 20, 8, 95, 1, 1, 1),
+        ("+1", 10, 20, 10, 8, 90, 1, 1, 2),
+        ("202-555-0199", 25, 20, 50, 8, 90, 1, 1, 2),
+        ("end", 10, 40, 15, 8, 90, 2, 1, 1),
+    ]))
+    assert eng._layout_text(words) == "John Doe\n+1 202-555-0199\n\nend"
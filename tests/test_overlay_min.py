@@ -1,4 +1,10 @@
-from services.redactor import make_overlay_pdf
+import io
+from PIL import Image
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import NameObject
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from services.redactor import make_overlay_pdf, merge_overlay
 
 def test_overlay_bytes():
     rects = [[(50, 50, 150, 80)]]
@@ -7,3 +13,99 @@ def test_overlay_bytes():
     data = buf.getvalue()
     assert isinstance(data, (bytes, bytearray))
     assert len(data) > 100
+
+def _pdf_bytes(n_pages: int) -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for i in range(n_pages):
+        c.drawString(100, 750, f"page {i} John Doe")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+def _scanned_pdf_bytes(n_pages: int, filter_name: str = None) -> bytes:
+    # every page generated on its own, so the same image is embedded n times
+    im = Image.effect_noise((200, 200), 64).convert("RGB")
+    writer = PdfWriter()
+    for _ in range(n_pages):
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf)
+        c.drawImage(ImageReader(im), 50, 400, 200, 200)
+        c.showPage()
+        c.save()
+        page = PdfReader(io.BytesIO(buf.getvalue())).pages[0]
+        if filter_name:
+            for ref in page["/Resources"]["/XObject"].values():
+                ref.get_object()[NameObject("/Filter")] = NameObject(filter_name)
+        writer.add_page(page)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+def _xobject_ids(path) -> set:
+    ids = set()
+    for page in PdfReader(str(path)).pages:
+        xobjs = page["/Resources"]["/XObject"]
+        ids.update(xobjs.raw_get(k).idnum for k in xobjs)
+    return ids
+
+def test_merge_skips_when_no_boxes(tmp_path):
+    raw = _pdf_bytes(2)
+    sizes = [(612.0, 792.0)] * 2
+    rects = [[], []]
+    out = tmp_path / "out.pdf"
+    merge_overlay(raw, make_overlay_pdf(rects, sizes), str(out), rects_per_page=rects)
+    assert out.read_bytes() == raw
+
+def test_merge_optimized_pages(tmp_path):
+    raw = _pdf_bytes(3)
+    sizes = [(612.0, 792.0)] * 3
+    rects = [[(50, 50, 150, 80)], [], [(60, 60, 160, 90)]]
+    out = tmp_path / "out.pdf"
+    merge_overlay(raw, make_overlay_pdf(rects, sizes), str(out), rects_per_page=rects, optimize=True)
+    pages = PdfReader(str(out)).pages
+    assert len(pages) == 3
+    assert pages[0].get_contents()["/Filter"] == "/FlateDecode"
+    assert b" re" in pages[0].get_contents().get_data()
+    assert b" re" not in pages[1].get_contents().get_data()
+
+def test_merge_shares_identical_images(tmp_path):
+    raw = _scanned_pdf_bytes(4)
+    sizes = [(612.0, 792.0)] * 4
+    rects = [[(50, 50, 150, 80)]] * 4
+    plain, opt = tmp_path / "plain.pdf", tmp_path / "opt.pdf"
+    merge_overlay(raw, make_overlay_pdf(rects, sizes), str(plain), rects_per_page=rects, optimize=False)
+    merge_overlay(raw, make_overlay_pdf(rects, sizes), str(opt), rects_per_page=rects, optimize=True)
+    assert len(_xobject_ids(plain)) == 4
+    assert len(_xobject_ids(opt)) == 1
+    assert opt.stat().st_size < plain.stat().st_size
+
+def test_merge_optimized_undecodable_filter(tmp_path):
+    # PyPDF2 can't decode JBIG2; dedup must not need to
+    raw = _scanned_pdf_bytes(2, filter_name="/JBIG2Decode")
+    sizes = [(612.0, 792.0)] * 2
+    rects = [[(50, 50, 150, 80)]] * 2
+    out = tmp_path / "out.pdf"
+    merge_overlay(raw, make_overlay_pdf(rects, sizes), str(out), rects_per_page=rects, optimize=True)
+    assert len(PdfReader(str(out)).pages) == 2
+
+def test_merge_hashes_shared_resources_once(tmp_path, monkeypatch):
+    from services import redactor
+    calls = []
+    real = redactor._digest
+    def counting(obj, depth=0):
+        if depth == 0:
+            calls.append(obj)
+        return real(obj, depth)
+    monkeypatch.setattr(redactor, "_digest", counting)
+
+    def top_level_calls(n_pages):
+        calls.clear()
+        rects = [[(50, 50, 150, 80)]] * n_pages
+        sizes = [(612.0, 792.0)] * n_pages
+        merge_overlay(_pdf_bytes(n_pages), make_overlay_pdf(rects, sizes), str(tmp_path / "out.pdf"),
+                      rects_per_page=rects, optimize=True)
+        return len(calls)
+
+    # the font is shared by every page, so page count must not change the work
+    assert top_level_calls(10) == top_level_calls(1)
@@ -15,3 +15,51 @@ def test_spacy_person_place():
     assert "GPE" in res["spacy"]
     # llm may be disabled in tests; just check key exists
     assert "llm" in res
+
+def test_prescreen_clean_pages():
+    from services.pii_detector import page_is_clean
+    assert page_is_clean("the invoice follows below.\nThe terms are attached.")
+    assert not page_is_clean("payment sent by John yesterday")
+    assert not page_is_clean("Maria signed it.")
+    assert not page_is_clean("contact: a@b.com")
+    assert not page_is_clean("Émile dropped off the package.")
+    assert not page_is_clean("signed by Ólafur yesterday")
+    assert not page_is_clean("the form was signed by 山田太郎 today")
+
+def test_prescreen_dates_and_numbers_are_dirty():
+    # /redact-pdf/ also redacts DATE/CARDINAL/MONEY, so these must reach NER
+    from services.pii_detector import page_is_clean
+    assert not page_is_clean("date of birth: 04/12/1985, account 12345678.")
+    assert not page_is_clean("paid $4,500 on march 3, 2024.")
+    assert not page_is_clean("born on the fourth of july")
+    assert not page_is_clean("owes twenty dollars")
+
+def test_prescreen_skips_ner_for_clean_pages(tmp_path, monkeypatch):
+    from config import settings
+    from services.pii_detector import prescreen_stats, reset_prescreen_stats
+    monkeypatch.setattr(settings, "STATS_DIR", str(tmp_path))
+    reset_prescreen_stats()
+    pages = ["intro paragraph.\n\nanother paragraph.\n\nthe end.", "nothing here either."]
+    res = PIIDetector("\n\n".join(pages), pages=pages).detect_all()
+    stats = prescreen_stats()
+    assert res["regex"] == {} and res["spacy"] == {}
+    # blank lines inside a page don't make extra pages
+    assert stats["pages_total"] == 2
+    assert stats["pages_skipped"] == 2
+    assert stats["docs_skipped"] == 1
+
+def test_prescreen_stats_summed_across_workers(tmp_path, monkeypatch):
+    import json
+    from config import settings
+    from services.pii_detector import prescreen_stats, reset_prescreen_stats
+    monkeypatch.setattr(settings, "STATS_DIR", str(tmp_path))
+    reset_prescreen_stats()
+    # another (possibly recycled) worker's totals
+    (tmp_path / "prescreen_1.json").write_text(json.dumps(
+        {"pages_total": 5, "pages_skipped": 3, "docs_skipped": 1, "time_saved_s": 1.5}))
+    PIIDetector("nothing sensitive.", pages=["nothing sensitive."]).detect_all()
+    stats = prescreen_stats()
+    assert stats["workers"] == 2
+    assert stats["pages_total"] == 6 and stats["pages_skipped"] == 4
+    assert stats["docs_skipped"] == 2
+    assert stats["time_saved_s"] >= 1.5